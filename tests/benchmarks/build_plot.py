@@ -1,193 +1,234 @@
 import argparse
-import csv
-import operator
+import functools
+import math
 from collections import defaultdict
-from pathlib import Path
+from typing import Any
 
+import matplotlib as mpl
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.ticker import FuncFormatter
+
+QUEUE_TYPE_COLUMN = 'param:queue_type'
+ITEM_SIZE_COLUMN = 'param:item_size'
+METRIC_COLUMNS = ['min', 'max', 'mean', 'median', 'stddev', 'ops']
+CHUNK_SIZE = 100_000
+
+# Units indexed by the power of 1024 (sizes) or 1000 (nanoseconds) they denote.
+SIZE_UNITS = ['B', 'KiB', 'MiB', 'GiB']
+TIME_UNITS = [('ns', 1), ('μs', 1), ('ms', 1), ('s', 3)]
 
 
 def read_and_process_data(
     filename: str,
-) -> dict[str, list[tuple[int, dict[str, float]]]]:
-    """Read benchmark data from a CSV file and process it."""
-    data = defaultdict(list)
-    with Path(filename).open(encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            queue_type = row['param:queue_type']
-            item_size = int(row['param:item_size'])
-            metrics = {
-                'min': float(row['min']),
-                'max': float(row['max']),
-                'mean': float(row['mean']),
-                'median': float(row['median']),
-                'stddev': float(row['stddev']),
-                'ops': float(row['ops']),
-            }
-            data[queue_type].append((item_size, metrics))
-
-    for queue_type in data:
-        data[queue_type].sort(key=operator.itemgetter(0))
+) -> dict[str, dict[str, np.ndarray]]:
+    """Read benchmark data from a CSV file and process it.
+
+    Returns:
+        Per queue type, a mapping of column name to array, where ``sizes``
+        holds the item sizes in ascending order and every metric column
+        (``min``, ``max``, ``mean``, ...) is aligned with it.
+    """
+    chunks: defaultdict[str, list[pd.DataFrame]] = defaultdict(list)
+    reader = pd.read_csv(
+        filename,
+        usecols=[QUEUE_TYPE_COLUMN, ITEM_SIZE_COLUMN, *METRIC_COLUMNS],
+        dtype={
+            QUEUE_TYPE_COLUMN: 'str',
+            ITEM_SIZE_COLUMN: 'int64',
+            **dict.fromkeys(METRIC_COLUMNS, 'float64'),
+        },
+        chunksize=CHUNK_SIZE,
+    )
+    with reader:
+        for chunk in reader:
+            for queue_type, group in chunk.groupby(
+                QUEUE_TYPE_COLUMN, sort=False
+            ):
+                chunks[str(queue_type)].append(group)
+
+    data: dict[str, dict[str, np.ndarray]] = {}
+    for queue_type, groups in chunks.items():
+        group = pd.concat(groups, ignore_index=True).sort_values(
+            ITEM_SIZE_COLUMN, kind='stable'
+        )
+        data[queue_type] = {
+            'sizes': group[ITEM_SIZE_COLUMN].to_numpy(),
+            **{metric: group[metric].to_numpy() for metric in METRIC_COLUMNS},
+        }
 
     return data
 
 
+@functools.lru_cache(maxsize=512)
 def format_size(size: int) -> str:
     """Format size in bytes into human-readable format (B, KiB, MiB, GiB)."""
-    if size < 1024:
+    exp = min((max(size, 1).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+    if not exp:
         return f'{size}B'
-    if size < 1024**2:
-        return f'{size / 1024:.1f}KiB'
-    if size < 1024**3:
-        return f'{size / (1024**2):.1f}MiB'
-    return f'{size / (1024**3):.1f}GiB'
+    return f'{size / (1 << (10 * exp)):.1f}{SIZE_UNITS[exp]}'
 
 
+@functools.lru_cache(maxsize=512)
 def format_time(time: float) -> str:
     """Format time in seconds into human-readable format (ns, μs, ms, s)."""
     time_ns = time * 1e9
-    if time_ns < 1000:
-        return f'{time_ns:.1f}ns'
-    if time_ns < 1e6:
-        return f'{time_ns / 1000:.1f}μs'
-    if time_ns < 1e9:
-        return f'{time_ns / 1e6:.1f}ms'
-    return f'{time:.3f}s'
-
-
-def draw_plot(
-    data: dict[str, list[tuple[int, dict[str, float]]]], output_file: str
-) -> None:
+    # NaN and +inf have no magnitude; like the old cascade, report them in s.
+    if math.isnan(time_ns) or time_ns == math.inf:
+        return f'{time:.3f}s'
+    exp = min(int(math.log10(max(time_ns, 1.0))) // 3, len(TIME_UNITS) - 1)
+    # log10 rounds up just below a power of 1000, so step back into range.
+    exp = max(exp - (time_ns < 1000**exp), 0)
+    unit, precision = TIME_UNITS[exp]
+    return f'{time_ns / 1000**exp:.{precision}f}{unit}'
+
+
+def draw_plot(data: dict[str, dict[str, np.ndarray]], output_file: str) -> None:
     """Draw a plot with dark theme and improved styling."""
-    plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(12, 8), facecolor='#1a1a1a')
-
-    # Custom color palette
-    colors = {
-        'zeroq': '#00ff9d',  # Neon green
-        'multiprocessing': '#ff4d4d',  # Bright red
-    }
-
-    markers = {'zeroq': 'o', 'multiprocessing': 'D'}
-
-    # Plot configuration
-    ax.set_facecolor('#1a1a1a')
-    ax.grid(visible=True, color='#404040', linestyle='--', alpha=0.6)
-
-    # Plot data
-    for queue_type, values in data.items():
-        sizes = [x[0] for x in values]
-        metrics = {
-            'mean': [x[1]['mean'] for x in values],
-            'min': [x[1]['min'] for x in values],
-            'max': [x[1]['max'] for x in values],
-        }
-        ax.loglog(
-            sizes,
-            metrics['mean'],
-            marker=markers[queue_type],
-            label=queue_type,
-            linewidth=2.5,
-            markersize=10,
-            color=colors[queue_type],
-            markerfacecolor='none',
-            markeredgewidth=2,
-            linestyle='-',
-            alpha=0.9,
-        )
-        ax.fill_between(
-            sizes,
-            metrics['min'],
-            metrics['max'],
-            color=colors[queue_type],
-            alpha=0.1,
+    with plt.style.context('dark_background'):
+        fig, ax = plt.subplots(
+            figsize=(12, 8), facecolor='#1a1a1a', layout='constrained'
         )
 
-        # Annotations with better positioning
-        for size, metric_values in values:
-            x = size
-            y = metric_values['mean']
-            label = format_time(y)
-
-            ax.annotate(
-                label,
-                xy=(x, y),
-                xytext=(0, 5 if queue_type == 'zeroq' else 40),
-                textcoords='offset points',
-                fontsize=9,
-                color=colors[queue_type],
-                ha='center',
-                va='bottom' if queue_type == 'zeroq' else 'top',
-                rotation=45,
-                alpha=0.85,
-                bbox={
+        # Custom color palette
+        colors = {
+            'zeroq': '#00ff9d',  # Neon green
+            'multiprocessing': '#ff4d4d',  # Bright red
+        }
+
+        markers = {'zeroq': 'o', 'multiprocessing': 'D'}
+
+        annotation_styles: dict[str, dict[str, Any]] = {
+            queue_type: {
+                'xytext': (0, 5 if queue_type == 'zeroq' else 40),
+                'textcoords': 'offset points',
+                'fontsize': 9,
+                'color': color,
+                'ha': 'center',
+                'va': 'bottom' if queue_type == 'zeroq' else 'top',
+                'rotation': 45,
+                'alpha': 0.85,
+                'bbox': {
                     'boxstyle': 'round,pad=0.2',
                     'facecolor': '#2a2a2a',
-                    'edgecolor': colors[queue_type],
+                    'edgecolor': color,
                     'alpha': 0.7,
                 },
+            }
+            for queue_type, color in colors.items()
+        }
+
+        # Plot configuration
+        ax.set_facecolor('#1a1a1a')
+        ax.grid(visible=True, color='#404040', linestyle='--', alpha=0.6)
+
+        # Plot data
+        for queue_type, columns in data.items():
+            ax.loglog(
+                columns['sizes'],
+                columns['mean'],
+                marker=markers[queue_type],
+                label=queue_type,
+                linewidth=2.5,
+                markersize=10,
+                color=colors[queue_type],
+                markerfacecolor='none',
+                markeredgewidth=2,
+                linestyle='-',
+                alpha=0.9,
+            )
+            ax.fill_between(
+                columns['sizes'],
+                columns['min'],
+                columns['max'],
+                color=colors[queue_type],
+                alpha=0.1,
             )
 
-    # Axis styling
-    ax.set_xscale('log')
-    ax.set_yscale('log')
-    ax.spines['bottom'].set_color('#606060')
-    ax.spines['left'].set_color('#606060')
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.set_ylim(bottom=ax.get_ylim()[0] * 0.8)
-
-    # Labels styling
-    ax.set_ylabel('Time per Operation', fontsize=13, color='white', labelpad=15)
-    ax.set_xlabel('Payload Size', fontsize=13, color='white', labelpad=15)
-
-    # Labels styling
-    ax.set_ylabel('Time per Operation', fontsize=13, color='white', labelpad=15)
-    ax.set_xlabel('Payload Size', fontsize=13, color='white', labelpad=15)
-
-    # Tick parameters
-    ax.tick_params(axis='both', which='both', colors='white', labelsize=11)
-    ax.tick_params(axis='x', which='minor', bottom=False)
-
-    # Custom x-ticks formatting
-    all_sizes = sorted({x[0] for values in data.values() for x in values})
-    ax.set_xticks(all_sizes)
-    ax.set_xticklabels(
-        [format_size(size) for size in all_sizes],
-        fontsize=10,
-        color='#cccccc',
-        rotation=30,
-    )
+        # Suspend autoscaling while annotating, so that each annotation does
+        # not trigger it; the limits are computed once it is re-enabled
+        ax.set_autoscale_on(False)
 
-    # Y-ticks formatting
-    yticks = ax.get_yticks()
-    ax.set_yticklabels(
-        [format_time(tick) for tick in yticks], fontsize=8, color='#cccccc'
-    )
+        # Annotations with better positioning
+        for queue_type, columns in data.items():
+            for size, mean in zip(
+                columns['sizes'].tolist(), columns['mean'].tolist()
+            ):
+                ax.annotate(
+                    format_time(mean),
+                    xy=(size, mean),
+                    **annotation_styles[queue_type],
+                )
+        ax.set_autoscale_on(True)
+
+        # Axis styling
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.spines['bottom'].set_color('#606060')
+        ax.spines['left'].set_color('#606060')
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.set_ylim(bottom=ax.get_ylim()[0] * 0.8)
+
+        # Labels styling
+        ax.set_ylabel(
+            'Time per Operation', fontsize=13, color='white', labelpad=15
+        )
+        ax.set_xlabel('Payload Size', fontsize=13, color='white', labelpad=15)
 
-    # Legend styling
-    legend = ax.legend(
-        fontsize=12,
-        framealpha=0.2,
-        loc='upper left',
-        facecolor='#2a2a2a',
-        edgecolor='#404040',
-    )
-    for text in legend.get_texts():
-        text.set_color('white')
-
-    plt.tight_layout()
-
-    if output_file:
-        plt.savefig(
-            output_file,
-            dpi=300,
-            bbox_inches='tight',
-            facecolor='#1a1a1a',
-            edgecolor='none',
+        # Labels styling
+        ax.set_ylabel(
+            'Time per Operation', fontsize=13, color='white', labelpad=15
+        )
+        ax.set_xlabel('Payload Size', fontsize=13, color='white', labelpad=15)
+
+        # Tick parameters
+        ax.tick_params(axis='both', which='both', colors='white', labelsize=11)
+        ax.tick_params(axis='x', which='minor', bottom=False)
+
+        # Custom x-ticks formatting
+        all_sizes = np.unique(
+            np.concatenate([columns['sizes'] for columns in data.values()])
+            if data
+            else np.empty(0, dtype=np.int64)
+        ).tolist()
+        ax.set_xticks(all_sizes)
+        ax.xaxis.set_major_formatter(
+            FuncFormatter(lambda value, _: format_size(int(value)))
+        )
+        ax.tick_params(
+            axis='x', labelsize=10, labelcolor='#cccccc', labelrotation=30
         )
-    plt.show()
+
+        # Y-ticks formatting
+        ax.yaxis.set_major_formatter(
+            FuncFormatter(lambda value, _: format_time(value))
+        )
+        ax.tick_params(axis='y', labelsize=8, labelcolor='#cccccc')
+
+        # Legend styling
+        legend = ax.legend(
+            fontsize=12,
+            framealpha=0.2,
+            loc='upper left',
+            facecolor='#2a2a2a',
+            edgecolor='#404040',
+        )
+        for text in legend.get_texts():
+            text.set_color('white')
+
+        if output_file:
+            plt.savefig(
+                output_file,
+                dpi=300,
+                bbox_inches=None,
+                facecolor='#1a1a1a',
+                edgecolor='none',
+            )
+            plt.close(fig)
+        else:
+            plt.show()
 
 
 if __name__ == '__main__':
@@ -195,5 +236,8 @@ if __name__ == '__main__':
     parser.add_argument('input_file')
     parser.add_argument('-o', '--output')
     args = parser.parse_args()
+    if args.output:
+        # Rendering straight to a file needs no GUI event loop.
+        mpl.use('Agg')
     processed_data = read_and_process_data(args.input_file)
     draw_plot(processed_data, args.output)
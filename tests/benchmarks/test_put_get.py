@@ -1,4 +1,5 @@
 import multiprocessing
+from collections.abc import Iterator
 from typing import Protocol
 
 import pytest
@@ -27,29 +28,46 @@ queue_types = ['multiprocessing', 'zeroq']
 item_sizes = [2**p for p in range(1, 28, 4)]
 
 
+@pytest.fixture(scope='module', params=item_sizes)
+def item_size(request: pytest.FixtureRequest) -> int:
+    """Returns the payload size shared by all queues of a parametrization."""
+    return request.param
+
+
+@pytest.fixture(scope='module')
+def queues(item_size: int) -> Iterator[dict[str, IQueue]]:
+    """Creates one queue of each type per item size and closes them after."""
+    mp_queue: multiprocessing.Queue[bytes] = multiprocessing.Queue()
+    zeroq_queue = zeroq.Queue(
+        name='benchmark',
+        element_size=item_size,
+        capacity=8,
+        create=True,
+    )
+
+    yield {'multiprocessing': mp_queue, 'zeroq': zeroq_queue}
+
+    zeroq_queue.close()
+    mp_queue.close()
+    mp_queue.join_thread()
+
+
+@pytest.mark.timeout(0)
 @pytest.mark.parametrize('queue_type', queue_types)
-@pytest.mark.parametrize('item_size', item_sizes)
 def test_put_item_get_item(
     benchmark,
-    queue_type: type[IQueue],
+    queues: dict[str, IQueue],
+    queue_type: str,
     item_size: int,
 ) -> None:
     """Benchmarks alternating put/get operations."""
-    queue: IQueue
-    if queue_type == 'multiprocessing':
-        queue = multiprocessing.Queue()
-    else:
-        queue = zeroq.Queue(
-            name='benchmark',
-            element_size=item_size,
-            capacity=8,
-            create=True,
-        )
-
-    item = bytes([1] * item_size)
+    queue = queues[queue_type]
+    item = b'\x01' * item_size
 
     benchmark.pedantic(
         put_item_get_item,
         args=(queue, item),
         iterations=1000,
+        rounds=10,
+        warmup_rounds=2,
     )
@@ -0,0 +1,10 @@
+import os
+
+from hypothesis import settings
+
+# Every example creates and destroys a shared memory segment, so keep the
+# example count modest and disable the deadline, which is dominated by
+# syscall latency rather than by the code under test.
+settings.register_profile('ci', max_examples=50, deadline=None)
+settings.register_profile('dev', max_examples=20, deadline=None)
+settings.load_profile(os.getenv('HYPOTHESIS_PROFILE', 'dev'))
@@ -0,0 +1,15 @@
+import os
+
+from hypothesis import strategies as st
+
+
+def shm_name(name: str) -> str:
+    """Returns a shared memory name unique to the current test process."""
+    return f'{name}-{os.getpid()}'
+
+
+def powers_of_two(min_exp: int, max_exp: int) -> st.SearchStrategy[int]:
+    """Returns a strategy generating powers of two within the given range."""
+    return st.builds(
+        lambda exp: 2**exp, st.integers(min_value=min_exp, max_value=max_exp)
+    )
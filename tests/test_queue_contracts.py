@@ -1,6 +1,9 @@
+from collections import deque
+from functools import lru_cache
 from typing import Any
 
 import pytest
+from helpers import powers_of_two, shm_name
 from hypothesis import given
 from hypothesis import strategies as st
 from hypothesis.stateful import (
@@ -14,17 +17,19 @@ from hypothesis.stateful import (
 from zeroq import Empty, Full, Queue
 
 
+@lru_cache(maxsize=128)
+def _zero_bytes(size: int) -> bytes:
+    """Return a cached zero-filled payload of the given size."""
+    return b'\x00' * size
+
+
 @st.composite
 def queue_and_items(draw: Any) -> tuple[int, int, list[bytes]]:
     """Return (element_size, capacity, items) for testing the queue."""
     # Generate a valid element size.
     element_size: int = draw(st.integers(min_value=8, max_value=1024))
     # Generate a capacity that is a power of two.
-    capacity: int = draw(
-        st.integers(min_value=2, max_value=1024).filter(
-            lambda x: (x & (x - 1)) == 0
-        )
-    )
+    capacity: int = draw(powers_of_two(1, 10))
     # Generate a list of items exactly equal to element_size.
     items: list[bytes] = draw(
         st.lists(
@@ -41,7 +46,7 @@ def test_fifo_order(data: tuple[int, int, list[bytes]]) -> None:
     """Test that items are dequeued in FIFO order."""
     element_size, capacity, items = data
     queue: Queue = Queue(
-        name='test-fifo',
+        name=shm_name('test-fifo'),
         element_size=element_size,
         capacity=capacity,
         create=True,
@@ -58,35 +63,32 @@ def test_fifo_order(data: tuple[int, int, list[bytes]]) -> None:
 
 @given(
     element_size=st.integers(min_value=8, max_value=1024),
-    capacity=st.integers(min_value=2, max_value=1024).filter(
-        lambda x: (x & (x - 1)) == 0
-    ),
+    capacity=powers_of_two(1, 10),
 )
 def test_put_nowait_full(element_size: int, capacity: int) -> None:
     """Test that put_nowait raises Full when the queue is full."""
     queue: Queue = Queue(
-        name='test-full',
+        name=shm_name('test-full'),
         element_size=element_size,
         capacity=capacity,
         create=True,
     )
+    item = _zero_bytes(element_size)
     for _ in range(capacity):
-        queue.put_nowait(b'\x00' * element_size)
+        queue.put_nowait(item)
 
     with pytest.raises(Full):
-        queue.put_nowait(b'\x00' * element_size)
+        queue.put_nowait(item)
 
 
 @given(
     element_size=st.integers(min_value=8, max_value=1024),
-    capacity=st.integers(min_value=2, max_value=1024).filter(
-        lambda x: (x & (x - 1)) == 0
-    ),
+    capacity=powers_of_two(1, 10),
 )
 def test_get_nowait_empty(element_size: int, capacity: int) -> None:
     """Test that get_nowait raises Empty when the queue is empty."""
     queue: Queue = Queue(
-        name='test-empty',
+        name=shm_name('test-empty'),
         element_size=element_size,
         capacity=capacity,
         create=True,
@@ -98,21 +100,19 @@ def test_get_nowait_empty(element_size: int, capacity: int) -> None:
 
 @given(
     element_size=st.integers(min_value=8, max_value=1024),
-    capacity=st.integers(min_value=2, max_value=1024).filter(
-        lambda x: (x & (x - 1)) == 0
-    ),
+    capacity=powers_of_two(1, 10),
 )
 def test_bool_semantics(element_size: int, capacity: int) -> None:
     """Test that __bool__ reflects the queue empty state."""
     queue: Queue = Queue(
-        name='test-bool',
+        name=shm_name('test-bool'),
         element_size=element_size,
         capacity=capacity,
         create=True,
     )
 
     assert not queue, 'Queue should be False when empty'
-    queue.put_nowait(b'\x00' * element_size)
+    queue.put_nowait(_zero_bytes(element_size))
     assert queue, 'Queue should be True when non-empty'
 
 
@@ -121,7 +121,7 @@ def test_len_invariant(data: tuple[int, int, list[bytes]]) -> None:
     """Test that len(queue) is between 0 and capacity."""
     element_size, capacity, items = data
     queue: Queue = Queue(
-        name='test-len',
+        name=shm_name('test-len'),
         element_size=element_size,
         capacity=capacity,
         create=True,
@@ -129,13 +129,15 @@ def test_len_invariant(data: tuple[int, int, list[bytes]]) -> None:
 
     for idx, item in enumerate(items):
         queue.put_nowait(item)
-        assert 0 <= len(queue) <= capacity
-        assert len(queue) == idx + 1
+        qlen = len(queue)
+        assert 0 <= qlen <= capacity
+        assert qlen == idx + 1
 
     for idx in range(len(items)):
         queue.get_nowait()
-        assert 0 <= len(queue) <= capacity
-        assert len(queue) == len(items) - idx - 1
+        qlen = len(queue)
+        assert 0 <= qlen <= capacity
+        assert qlen == len(items) - idx - 1
 
 
 class QueueStateMachine(RuleBasedStateMachine):
@@ -144,30 +146,30 @@ class QueueStateMachine(RuleBasedStateMachine):
     element_size: int
     capacity: int
     queue: Queue
-    model: list[bytes]
+    peer: Queue
+    model: deque[bytes]
 
     @initialize(
         element_size=st.integers(min_value=8, max_value=1024),
-        capacity=st.integers(min_value=2, max_value=1024).filter(
-            lambda x: (x & (x - 1)) == 0
-        ),
+        capacity=powers_of_two(1, 10),
     )
     def init_queue(self, element_size: int, capacity: int) -> None:
-        """Initialize the queue and the model list."""
+        """Initialize the queue, a second handle to it and the model deque."""
         self.element_size = element_size
         self.capacity = capacity
         self.queue = Queue(
-            name='state-queue',
+            name=shm_name('state-queue'),
             element_size=element_size,
             capacity=capacity,
             create=True,
         )
-        self.model = []
+        self.peer = Queue(name=shm_name('state-queue'), create=False)
+        self.model = deque()
 
     @rule(data=st.data())
     @precondition(lambda self: len(self.model) < self.capacity)
     def enqueue(self, data: Any) -> None:
-        """Enqueue an item and update the model list."""
+        """Enqueue an item and update the model deque."""
         item: bytes = data.draw(
             st.binary(min_size=self.element_size, max_size=self.element_size)
         )
@@ -179,7 +181,7 @@ class QueueStateMachine(RuleBasedStateMachine):
     def dequeue(self) -> None:
         """Dequeue an item and compare with the model's first item."""
         result: bytes = self.queue.get_nowait()
-        expected: bytes = self.model.pop(0)
+        expected: bytes = self.model.popleft()
         assert result == expected
 
     @rule(data=st.data())
@@ -225,11 +227,11 @@ class QueueStateMachine(RuleBasedStateMachine):
     @invariant()
     def check_shared_memory_consistency(self) -> None:
         """Invariant: Another queue instance must see the same length."""
-        other_queue: Queue = Queue(name='state-queue', create=False)
-        assert len(other_queue) == len(self.queue)
+        assert len(self.peer) == len(self.queue)
 
     def teardown(self) -> None:
         """Clean up shared memory after the test run."""
+        self.peer.close()
         self.queue.close()
 
 
@@ -1,17 +1,11 @@
 import pytest
+from helpers import powers_of_two, shm_name
 from hypothesis import given
 from hypothesis import strategies as st
 
 from zeroq import Queue
 
 
-def powers_of_two(min_exp: int, max_exp: int):
-    """Returns a strategy generating powers of two within the given range."""
-    return st.builds(
-        lambda exp: 2**exp, st.integers(min_value=min_exp, max_value=max_exp)
-    )
-
-
 @given(
     element_size=st.integers(min_value=8, max_value=1024 * 1024),
     capacity=powers_of_two(2, 16),
@@ -21,7 +15,7 @@ def test_queue_create_valid_parameters(
 ) -> None:
     """Tests queue creation with valid element size and capacity."""
     queue = Queue(
-        name='test-queue-shm',
+        name=shm_name('test-queue-shm'),
         element_size=element_size,
         capacity=capacity,
         create=True,
@@ -48,7 +42,7 @@ def test_queue_create_requires_element_size_and_capacity(
     """Ensures element size and capacity are required when create=True."""
     with pytest.raises(ValueError, match='required when create=true'):
         Queue(
-            name='test-queue',
+            name=shm_name('test-queue'),
             element_size=element_size,
             capacity=capacity,
             create=True,
@@ -64,7 +58,7 @@ def test_queue_create_negative_values(element_size: int, capacity: int):
         OverflowError, match="can't convert negative int to unsigned"
     ):
         Queue(
-            name='test-queue',
+            name=shm_name('test-queue'),
             element_size=element_size,
             capacity=capacity,
             create=True,
@@ -81,7 +75,7 @@ def test_queue_create_invalid_capacity(element_size: int, capacity: int):
     """Ensures queue capacity must be a power of two."""
     with pytest.raises(ValueError, match='must be a power of two'):
         Queue(
-            name='test-queue',
+            name=shm_name('test-queue'),
             element_size=element_size,
             capacity=capacity,
             create=True,
@@ -90,12 +84,12 @@ def test_queue_create_invalid_capacity(element_size: int, capacity: int):
 
 def test_queue_create_from_existing_segment():
     """Tests that a queue cannot be created if a segment exists."""
-    queue = Queue('test-queue', 1, 2, create=True)
+    queue = Queue(shm_name('test-queue'), 1, 2, create=True)
     queue.put_nowait(b'1')
 
     with pytest.raises(OSError, match='specific ID already exists'):
         Queue(
-            name='test-queue',
+            name=shm_name('test-queue'),
             element_size=8,
             capacity=8,
             create=True,
@@ -116,7 +110,7 @@ def test_queue_create_1gb_memory() -> None:
     capacity = max_shm_size // element_size
 
     queue = Queue(
-        name='test-max-memory',
+        name=shm_name('test-max-memory'),
         element_size=element_size,
         capacity=capacity,
         create=True,
@@ -136,13 +130,13 @@ def test_queue_create_from_existing_valid(
 ) -> None:
     """Ensures a queue can be accessed by multiple instances."""
     existing_queue = Queue(
-        name='test-queue',
+        name=shm_name('test-queue'),
         element_size=element_size,
         capacity=capacity,
         create=True,
     )
 
-    queue = Queue(name='test-queue', create=False)
+    queue = Queue(name=shm_name('test-queue'), create=False)
 
     assert queue.element_size == element_size
     assert queue.maxsize == capacity
@@ -154,4 +148,4 @@ def test_queue_create_from_existing_valid(
 def test_queue_create_from_existing_invalid() -> None:
     """Tests that accessing a non-existing queue raises an error."""
     with pytest.raises(OSError, match='Failed to open shared memory'):
-        Queue(name='test-queue', create=False)
+        Queue(name=shm_name('test-queue'), create=False)